@@ -1,12 +1,15 @@
 # -*- coding: utf-8 -*-
 import sys
+import math
+import functools
 import numpy as np
-import matplotlib.pyplot as plt
+import matplotlib
+from matplotlib.colors import Normalize
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.backends.backend_qtagg import NavigationToolbar2QT as NavigationToolbar
 from matplotlib import font_manager
 from matplotlib.ticker import MaxNLocator
-from scipy.stats import norm as scipy_norm # For CDF
 
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
@@ -15,17 +18,41 @@ from PySide6.QtWidgets import (
     QToolButton, QTextBrowser, QScrollArea, QSplitter, QComboBox,
     QSizePolicy, QFileDialog
 )
-from PySide6.QtGui import QFont, QIcon, QPalette, QColor, QPixmap, QTextCursor, QMouseEvent
-from PySide6.QtCore import Qt, Slot, QSize, Signal
+from PySide6.QtGui import QFont, QIcon, QPalette, QColor, QPixmap, QTextCursor, QTextDocument, QMouseEvent
+from PySide6.QtCore import Qt, Slot, QSize, Signal, QObject, QTimer, QRunnable, QThreadPool
+
+try:
+    from numba import njit, prange # 可选依赖：大网格的并行计算内核
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
 
 # --- 信号传播模型等 ---
+ZH_FONT = None # 中文字体，标题与坐标轴标签直接引用，省去按字体族名的查找
 try:
     font_path = "C:/Windows/Fonts/simhei.ttf" # 字体文件路径，用于Matplotlib显示中文
-    font_prop = font_manager.FontProperties(fname=font_path)
-    plt.rcParams['font.family'] = font_prop.get_name()
+    font_manager.fontManager.addfont(font_path)
+    ZH_FONT = font_manager.FontProperties(fname=font_path)
+    matplotlib.rcParams['font.sans-serif'] = [ZH_FONT.get_name()] + matplotlib.rcParams['font.sans-serif']
+    matplotlib.rcParams['font.family'] = 'sans-serif'
 except FileNotFoundError:
     print("警告：指定的字体文件未找到，Matplotlib 中文可能无法正常显示。")
-plt.rcParams['axes.unicode_minus'] = False # 解决Matplotlib坐标轴负号显示问题
+matplotlib.rcParams['axes.unicode_minus'] = False # 解决Matplotlib坐标轴负号显示问题
+
+# 各环境的附加损耗系数: (clutter_base, clutter_coef, ple_coef)
+_ENV_COEFS = {
+    'urban_dense': (20.0, 0.1, 18.0),
+    'urban_macro': (15.0, 0.05, 12.0),
+    'suburban': (10.0, 0.0, 8.0),
+    'rural_macro': (3.0, 0.0, 5.0),
+}
+_NUMBA_MIN_CELLS = 10000 # 网格点数超过该值时使用 Numba 内核
+_BLOCK_Y, _BLOCK_X = 128, 128 # NumPy 路径的分块大小，单块中间数组可留在 L2 缓存中
+_CDF_MAX_POINTS = 4096 # CDF 曲线最多绘制的采样点数
+_LUT_SIZE = 4096 # Numba 内核使用的一维距离查找表长度
+_LUT_EXACT_BINS = 16 # 距基站不足该数量个表间距的网格点仍精确计算（对数曲线在近处弯曲最大，16 个间距外插值误差 < 0.01 dB）
+_LUT_KINK_BINS = 2 # 附加损耗 max(clutter + ple, 0) 的拐点两侧该数量个表间距内同样精确计算
+_ROW_TEMPLATE = "<tr><td><span class='{style_class}'>{name}</span></td><td>{rsrp_range}</td><td>{percentage:.1f}% ({count}点)</td><td>{experience}</td></tr>" # 分析报告中质量分布表的一行
 
 
 def signal_strength_model(distance, transmit_power_dbm=30, frequency_mhz=2600,
@@ -41,66 +68,236 @@ def signal_strength_model(distance, transmit_power_dbm=30, frequency_mhz=2600,
 
     fspl_m = 20 * np.log10(distance) + 20 * np.log10(frequency_mhz) - 27.55
 
-    additional_loss = 0
-    clutter_factor = 0
-    path_loss_exponent_factor = 0
-
-    if environment_type == 'urban_dense':
-        clutter_factor = 20 + 0.1 * (frequency_mhz / 1000) * np.log10(distance + 1)
-        path_loss_exponent_factor = 18 * np.log10(distance_km + 0.001)
-        additional_loss = clutter_factor + path_loss_exponent_factor
-    elif environment_type == 'urban_macro':
-        clutter_factor = 15 + 0.05 * (frequency_mhz / 1000) * np.log10(distance + 1)
-        path_loss_exponent_factor = 12 * np.log10(distance_km + 0.001)
-        additional_loss = clutter_factor + path_loss_exponent_factor
-    elif environment_type == 'suburban':
-        clutter_factor = 10
-        path_loss_exponent_factor = 8 * np.log10(distance_km + 0.001)
-        additional_loss = clutter_factor + path_loss_exponent_factor
-    elif environment_type == 'rural_macro':
-        clutter_factor = 3
-        path_loss_exponent_factor = 5 * np.log10(distance_km + 0.001)
-        additional_loss = clutter_factor + path_loss_exponent_factor
-
-    additional_loss = max(0, additional_loss)
+    # 未知环境类型不计附加损耗
+    clutter_base, clutter_coef, ple_coef = _ENV_COEFS.get(environment_type, (0.0, 0.0, 0.0))
+    clutter_factor = clutter_base + clutter_coef * (frequency_mhz / 1000) * np.log10(distance + 1)
+    path_loss_exponent_factor = ple_coef * np.log10(distance_km + 0.001)
+    additional_loss = max(0, clutter_factor + path_loss_exponent_factor)
     path_loss = fspl_m + additional_loss
     eirp_dbm = transmit_power_dbm + antenna_gain_dbi
     received_power_dbm = eirp_dbm - path_loss
     return received_power_dbm
 
 
+def signal_strength_array(distances, transmit_power_dbm=30, frequency_mhz=2600,
+                          antenna_gain_dbi=15, environment_type='urban_dense'):
+    # 与 signal_strength_model 相同的模型，但一次处理整个距离数组；float32 输入保持 float32 计算
+    distances = np.asarray(distances)
+    if distances.dtype != np.float32:
+        distances = distances.astype(float)
+    if frequency_mhz <= 0:
+        return np.where(distances <= 0, transmit_power_dbm - 200, transmit_power_dbm - 300)
+
+    # log10(distance_km + 0.001) == log10(distance + 1) - 3，两处损耗共用同一次对数运算
+    log_d = np.log10(np.maximum(distances, 1e-9))
+    log_d1 = np.log10(distances + 1)
+    fspl_m = 20 * log_d + (20 * math.log10(frequency_mhz) - 27.55)
+
+    # 未知环境类型不计附加损耗
+    clutter_base, clutter_coef, ple_coef = _ENV_COEFS.get(environment_type, (0.0, 0.0, 0.0))
+    clutter_factor = clutter_base + clutter_coef * (frequency_mhz / 1000) * log_d1
+    path_loss_exponent_factor = ple_coef * (log_d1 - 3)
+    additional_loss = np.maximum(clutter_factor + path_loss_exponent_factor, 0)
+
+    path_loss = fspl_m + additional_loss
+    eirp_dbm = transmit_power_dbm + antenna_gain_dbi
+    received_power_dbm = eirp_dbm - path_loss
+    return np.where(distances <= 0, transmit_power_dbm - 200, received_power_dbm)
+
+
+if HAS_NUMBA:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _strength_kernel(x, y, bs_x, bs_y, tx_power, freq, gain, clutter_base, clutter_coef, ple_coef,
+                         table, inv_h, exact_radius, kink_lo, kink_hi, out):
+        # 单次遍历完成 距离 -> 接收功率，不产生中间数组
+        # 模型只依赖到基站的距离：远处网格点在一维表 table 上线性插值，省去每点两次 log10
+        fspl_const = 20.0 * math.log10(freq) - 27.55
+        clutter_scale = clutter_coef * (freq / 1000.0)
+        eirp_dbm = tx_power + gain
+        last = table.shape[0] - 1
+        for i in prange(y.shape[0]):
+            dy = y[i] - bs_y
+            for j in range(x.shape[0]):
+                d = math.hypot(x[j] - bs_x, dy)
+                if d >= exact_radius and not (kink_lo < d < kink_hi):
+                    t = d * inv_h
+                    k = min(int(t), last - 1)
+                    out[i, j] = table[k] + (t - k) * (table[k + 1] - table[k])
+                    continue
+                if d <= 0.0:
+                    out[i, j] = tx_power - 200.0
+                    continue
+                log_d1 = math.log10(d + 1.0)
+                fspl_m = 20.0 * math.log10(d) + fspl_const
+                clutter_factor = clutter_base + clutter_scale * log_d1
+                path_loss_exponent_factor = ple_coef * (log_d1 - 3.0)
+                additional_loss = max(clutter_factor + path_loss_exponent_factor, 0.0)
+                out[i, j] = eirp_dbm - (fspl_m + additional_loss)
+
+
+def _disable_numba(error):
+    # Numba 已安装但内核编译或加载缓存失败（版本不匹配、缓存损坏等）：本进程内改走 NumPy 分块路径
+    global HAS_NUMBA
+    HAS_NUMBA = False
+    print(f"警告：Numba 计算内核不可用，改用 NumPy 计算: {error}")
+
+def warmup_strength_kernel():
+    # 用与 simulate_signal_strength 相同的参数类型调用一次内核，触发 JIT 编译或加载磁盘缓存
+    if not HAS_NUMBA: return
+    axis = np.zeros(4, dtype=np.float32)
+    try:
+        _strength_kernel(axis, axis, 0.0, 0.0, 40.0, 2600.0, 17.0, *_ENV_COEFS['urban_dense'],
+                         np.zeros(_LUT_SIZE), 1.0, 1.0, -1.0, -1.0, np.empty((4, 4), dtype=np.float32))
+    except Exception as e: _disable_numba(e)
+
+
 def create_grid(x_min, x_max, y_min, y_max, step):
     if step <= 0:
         raise ValueError("网格步长必须为正数。")
-    x = np.arange(x_min, x_max + step, step)
-    y = np.arange(y_min, y_max + step, step)
-    if x_min >= x_max: x = np.array([x_min])
-    if y_min >= y_max: y = np.array([y_min])
-    xx, yy = np.meshgrid(x, y)
-    return xx, yy
+    # RSRP 仅用于可视化与统计，float32 精度足够且内存带宽减半；坐标先按 float64 生成再转换，float32 的 arange 会累积误差（±1000、步长 0.1 时末点偏到 999.51）
+    x = np.arange(x_min, x_max + step, step).astype(np.float32)
+    y = np.arange(y_min, y_max + step, step).astype(np.float32)
+    if x_min >= x_max: x = np.array([x_min], dtype=np.float32)
+    if y_min >= y_max: y = np.array([y_min], dtype=np.float32)
+    # 只返回一维坐标轴，二维网格由广播隐式构成，避免 meshgrid 的整网格分配
+    return x, y
 
 
 def simulate_signal_strength(grid, base_station_params, transmit_power_dbm,
-                             frequency_mhz, antenna_gain_dbi, environment_type):
-    xx, yy = grid
+                             frequency_mhz, antenna_gain_dbi, environment_type, out=None):
+    # out: 可选的 (len(y), len(x)) float32 输出缓冲区，重复仿真时复用以免每次重新分配
+    x, y = grid
     bs_x, bs_y = base_station_params['x'], base_station_params['y']
+    if out is None:
+        out = np.empty((y.size, x.size), dtype=np.float32)
+
+    if x.size == 1 and y.size == 1:
+        # 单点直接走标量模型，避开数组分配与 ufunc 调度开销
+        distance = math.hypot(float(x[0]) - bs_x, float(y[0]) - bs_y)
+        strength = signal_strength_model(distance, transmit_power_dbm=transmit_power_dbm,
+                                         frequency_mhz=frequency_mhz, antenna_gain_dbi=antenna_gain_dbi,
+                                         environment_type=environment_type)
+        out[0, 0] = strength
+        return out
+
+    if HAS_NUMBA and x.size * y.size > _NUMBA_MIN_CELLS and frequency_mhz > 0:
+        clutter_base, clutter_coef, ple_coef = _ENV_COEFS.get(environment_type, (0.0, 0.0, 0.0))
+        # 坐标轴单调，最远距离由两端点即可确定；查找表覆盖 [0, d_max]，用向量化模型精确求值
+        d_max = math.hypot(max(abs(float(x[0]) - bs_x), abs(float(x[-1]) - bs_x)),
+                           max(abs(float(y[0]) - bs_y), abs(float(y[-1]) - bs_y)))
+        table = signal_strength_array(np.linspace(0.0, d_max, _LUT_SIZE), transmit_power_dbm=transmit_power_dbm,
+                                      frequency_mhz=frequency_mhz, antenna_gain_dbi=antenna_gain_dbi,
+                                      environment_type=environment_type)
+        h = d_max / (_LUT_SIZE - 1)
+        # 附加损耗在 clutter + ple = 0 处折成 0，线性插值跨过该拐点误差随表间距增大；解出拐点距离，其附近也精确计算
+        loss_slope = clutter_coef * (frequency_mhz / 1000.0) + ple_coef
+        kink_d = 10.0 ** ((3.0 * ple_coef - clutter_base) / loss_slope) - 1.0 if loss_slope > 0 else -1.0
+        try:
+            _strength_kernel(x, y, float(bs_x), float(bs_y), float(transmit_power_dbm), float(frequency_mhz),
+                             float(antenna_gain_dbi), clutter_base, clutter_coef, ple_coef,
+                             table, 1.0 / h, _LUT_EXACT_BINS * h, kink_d - _LUT_KINK_BINS * h, kink_d + _LUT_KINK_BINS * h, out)
+            return out
+        except Exception as e: _disable_numba(e) # out 可能已部分写入，下面的 NumPy 路径会整体覆盖
+
+    dx2 = (x - np.float32(bs_x)) ** 2
+    dy2 = (y - np.float32(bs_y)) ** 2
+    distance_buf = np.empty((min(y.size, _BLOCK_Y), min(x.size, _BLOCK_X)), dtype=np.float32)
+    for iy in range(0, y.size, _BLOCK_Y):
+        for ix in range(0, x.size, _BLOCK_X):
+            dy2_tile, dx2_tile = dy2[iy:iy + _BLOCK_Y], dx2[ix:ix + _BLOCK_X]
+            distances = distance_buf[:dy2_tile.size, :dx2_tile.size]
+            np.add(dy2_tile[:, None], dx2_tile[None, :], out=distances)
+            np.sqrt(distances, out=distances)
+            out[iy:iy + _BLOCK_Y, ix:ix + _BLOCK_X] = signal_strength_array(
+                distances,
+                transmit_power_dbm=transmit_power_dbm,
+                frequency_mhz=frequency_mhz,
+                antenna_gain_dbi=antenna_gain_dbi,
+                environment_type=environment_type)
+    return out
+
+@functools.lru_cache(maxsize=64)
+def _render_report_header(total_area_sqm, max_rsrp, min_rsrp, avg_rsrp):
+    return f"<div class='card-header'><h3>覆盖分析与专业解读</h3></div><div class='card-content'><p><b>仿真区域概况：</b>...约 <b>{total_area_sqm:.0f} 平方米</b> ...</p><p><b>关键RSRP指标：</b><ul><li>最高RSRP: <span class='rsrp-excellent'>{max_rsrp:.1f} dBm</span></li><li>最低RSRP: <span class='rsrp-poor'>{min_rsrp:.1f} dBm</span></li><li>区域平均RSRP: {avg_rsrp:.1f} dBm</li></ul></p><h4>RSRP电平质量分布...：</h4><p>RSRP ...</p><table><tr><th>质量等级</th><th>RSRP范围 (dBm)</th><th>覆盖点占比</th><th>典型用户体验</th></tr>"
+
+
+@functools.lru_cache(maxsize=256)
+def _render_row(name, rsrp_range, count, style_class, experience, percentage):
+    return _ROW_TEMPLATE.format(style_class=style_class, name=name, rsrp_range=rsrp_range, percentage=percentage, count=count, experience=experience)
+
+
+def build_analysis_report_html(sorted_valid, total_points, total_area_sqm):
+    # sorted_valid: 去除 NaN 并已排序的一维 RSRP 数据；total_points: 网格总点数（含 NaN）。无有效数据时返回空字符串
+    # 纯 NumPy + 字符串运算，不调用任何 Qt 接口，可在后台线程中执行
+    if sorted_valid.size == 0: return ""
+    max_rsrp, min_rsrp, avg_rsrp = sorted_valid[-1], sorted_valid[0], sorted_valid.mean()
+    excellent_rsrp, good_rsrp, fair_rsrp, poor_rsrp = -80, -95, -105, -115
+    # 四个门限各做一次二分查找即得五档计数（索引 0..4 依次为 差/边缘/一般/良好/极好），NaN 不计入任何档位
+    counts = np.diff(np.concatenate(([0], np.searchsorted(sorted_valid, [poor_rsrp, fair_rsrp, good_rsrp, excellent_rsrp]), [sorted_valid.size])))
+    cat_counts = {"poor": counts[0], "marginal": counts[1], "fair": counts[2], "good": counts[3], "excellent": counts[4]}
+    total_points = total_points if total_points > 0 else 1
+    # 行与表头按其显示精度取整后查缓存：参数未变的重复仿真直接复用已渲染的 HTML 片段
+    html_parts = [_render_report_header(round(float(total_area_sqm)), round(float(max_rsrp), 1), round(float(min_rsrp), 1), round(float(avg_rsrp), 1))]
+    levels_info = [("极好", f"≥ {excellent_rsrp}", cat_counts["excellent"], "rsrp-excellent", "高清视频流畅..."), ("良好", f"{good_rsrp} ~ {excellent_rsrp - 0.1:.1f}", cat_counts["good"], "rsrp-good", "网页浏览顺畅..."), ("一般", f"{fair_rsrp} ~ {good_rsrp - 0.1:.1f}", cat_counts["fair"], "rsrp-fair", "基本数据业务..."), ("边缘", f"{poor_rsrp} ~ {fair_rsrp - 0.1:.1f}", cat_counts["marginal"], "rsrp-marginal", "信号弱..."), ("差", f"< {poor_rsrp}", cat_counts["poor"], "rsrp-poor", "可能无法接入...")]
+    for name, rsrp_range, count, style_class, experience in levels_info: html_parts.append(_render_row(name, rsrp_range, int(count), style_class, experience, round(int(count) / total_points * 100, 1)))
+    html_parts.append("</table><div class='pro-tip'><b>专业解读：</b>...</div></div>")
+    return ''.join(html_parts)
+
+
+# --- Background analysis ---
+class AnalysisSignals(QObject):
+    # (generation, 报告 HTML, 排序后的有效数据, 错误信息)；跨线程发射时自动排队到 GUI 线程，错误信息为空表示成功
+    # 不设父对象：由主窗口与进行中的任务共同引用，窗口先于任务销毁时任务仍可安全发射（接收方已断开，结果被丢弃）
+    finished = Signal(int, str, object, str)
+
+
+class AnalysisWorker(QRunnable):
+    # 在线程池中完成排序与报告 HTML 构建；绘图等 Qt/Matplotlib 操作留在 GUI 线程
+    def __init__(self, generation, valid, total_points, total_area_sqm, signals):
+        super().__init__()
+        self.generation, self.valid, self.total_points, self.total_area_sqm = generation, valid, total_points, total_area_sqm
+        self.signals = signals
+
+    def run(self):
+        # 线程池中的异常不会传回 run_simulation 的 try/except，需转成错误结果交给 GUI 线程提示
+        try:
+            sorted_valid = np.sort(self.valid)
+            html = build_analysis_report_html(sorted_valid, self.total_points, self.total_area_sqm)
+        except Exception as e: import traceback; traceback.print_exc(); self.signals.finished.emit(self.generation, "", None, str(e)); return
+        self.signals.finished.emit(self.generation, html, sorted_valid, "")
 
-    if xx.shape == (1, 1) and yy.shape == (1, 1):
-        distances = np.array([[np.sqrt((xx[0, 0] - bs_x) ** 2 + (yy[0, 0] - bs_y) ** 2)]])
-    else:
-        distances = np.sqrt((xx - bs_x) ** 2 + (yy - bs_y) ** 2)
-
-    v_signal_strength = np.vectorize(signal_strength_model,
-                                     excluded=['transmit_power_dbm', 'frequency_mhz', 'antenna_gain_dbi',
-                                               'environment_type'])
-    strengths = v_signal_strength(distances,
-                                  transmit_power_dbm=transmit_power_dbm,
-                                  frequency_mhz=frequency_mhz,
-                                  antenna_gain_dbi=antenna_gain_dbi,
-                                  environment_type=environment_type)
-    return strengths
 
 # --- Helper for Sliders ---
+class _SliderSpinSync(QObject):
+    # 滑块与数值框的双向同步（blockSignals 避免 slider <-> spinbox 回弹），槽为绑定方法而非闭包
+    # 拖动滑块时 valueChanged 每秒触发上百次；valueSettled 只在数值停止变化 delay_ms 后发出一次
+    valueSettled = Signal(float)
+
+    def __init__(self, slider, spinbox, multiplier, delay_ms=150, parent=None):
+        super().__init__(parent)
+        self.slider, self.spinbox, self.multiplier = slider, spinbox, multiplier
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay_ms)
+        self.timer.timeout.connect(self._emit_settled)
+        slider.valueChanged.connect(self._from_slider)
+        spinbox.valueChanged.connect(self._from_spin)
+
+    @Slot(int)
+    def _from_slider(self, val):
+        self.spinbox.blockSignals(True); self.spinbox.setValue(val / self.multiplier); self.spinbox.blockSignals(False)
+        self.timer.start()
+
+    @Slot(float)
+    def _from_spin(self, val):
+        self.slider.blockSignals(True); self.slider.setValue(int(val * self.multiplier)); self.slider.blockSignals(False)
+        self.timer.start()
+
+    @Slot()
+    def _emit_settled(self):
+        self.valueSettled.emit(self.spinbox.value())
+
+
 def create_slider_spinbox_combo(param_label_text, info_key, emoji, min_val, max_val, default_val, step_val, decimals=1, parent_app=None):
     container = QWidget()
     layout = QHBoxLayout(container)
@@ -139,15 +336,14 @@ def create_slider_spinbox_combo(param_label_text, info_key, emoji, min_val, max_
     spinbox.setObjectName("InputField")
     spinbox.setMinimumWidth(80) # Ensure spinbox is wide enough
 
-    # Connect slider and spinbox
-    slider.valueChanged.connect(lambda val: spinbox.setValue(val / slider_multiplier))
-    spinbox.valueChanged.connect(lambda val: slider.setValue(int(val * slider_multiplier)))
+    # Connect slider and spinbox; downstream consumers should connect to sync.valueSettled rather than valueChanged
+    sync = _SliderSpinSync(slider, spinbox, slider_multiplier, parent=container)
 
     layout.addWidget(label_widget, 1) # Label part takes less stretch
     layout.addWidget(slider, 3)     # Slider takes more stretch
     layout.addWidget(spinbox, 1)   # Spinbox takes less stretch
 
-    return container, slider, spinbox
+    return container, slider, spinbox, sync
 
 
 # --- 模型结束 ---
@@ -167,6 +363,70 @@ class ClickableLabel(QLabel):
         super().mousePressEvent(event)
 
 
+# 全局 Qt 样式表：模块级常量，只构造一次，由主窗口统一设置
+_QSS = """
+    QMainWindow { background-color: #F4F6F8; }
+    QSplitter#MainSplitter::handle { background-color: #D1D8E0; width: 1px; }
+    QWidget#LeftPanel { background-color: #FFFFFF; border-right: 1px solid #E0E5EA; }
+    QScrollArea#ParameterScrollArea { border: none; background-color: transparent; }
+    QWidget#ParamInputCardWidget { background-color: #FFFFFF; }
+    QGroupBox#ParameterGroup {
+        font-family: "Segoe UI Semibold", "Microsoft YaHei UI Semibold", sans-serif;
+        font-size: 12pt; color: #2C3A47; border: 1px solid #E7E9EC;
+        border-radius: 8px; margin-top: 12px; padding: 10px 15px 15px 15px;
+        background-color: #FCFDFE;
+    }
+    QGroupBox#ParameterGroup::title {
+        subcontrol-origin: margin; subcontrol-position: top left; padding: 5px 12px;
+        margin-left: 10px; background-color: #5D6D7E; color: #FFFFFF;
+        border-radius: 6px; font-size: 10pt; font-weight: bold;
+    }
+    QLabel#EmojiIconLabel { font-size: 12pt; padding-right: 4px; }
+    QLabel#ClickableParamLabel {
+        font-family: "Segoe UI", "Microsoft YaHei UI", sans-serif;
+        font-size: 10pt; color: #34495E; padding: 4px 0px; text-decoration: none;
+    }
+    QLabel#ClickableParamLabel:hover { color: #007BFF; text-decoration: underline; }
+    QSpinBox#InputField, QDoubleSpinBox#InputField, QComboBox#ComboBoxField {
+        font-family: "Segoe UI", "Consolas", monospace;
+        font-size: 10pt; padding: 7px 9px; border: 1px solid #CCD1D9;
+        border-radius: 5px; background-color: #FDFEFE; color: #1F2933; min-height: 24px;
+    }
+    QComboBox#ComboBoxField QAbstractItemView { 
+        border: 1px solid #CCD1D9; background-color: white;
+        selection-background-color: #007BFF; font-size: 10pt;
+    }
+    QSpinBox#InputField:focus, QDoubleSpinBox#InputField:focus, QComboBox#ComboBoxField:focus {
+        border-color: #007BFF; background-color: #FFFFFF; 
+    }
+    QSlider::groove:horizontal { border: 1px solid #bbb; background: white; height: 8px; border-radius: 4px; }
+    QSlider::sub-page:horizontal { background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #007BFF, stop:1 #56CCF2); border: 1px solid #777; height: 8px; border-radius: 4px; }
+    QSlider::add-page:horizontal { background: #fff; border: 1px solid #777; height: 8px; border-radius: 4px; }
+    QSlider::handle:horizontal { background: qradialgradient(cx:0.5, cy:0.5, radius:0.5, fx:0.5, fy:0.5, stop:0.6 #e1e1e1, stop:0.776 #3D72A4); border: 1px solid #777; width: 16px; margin-top: -4px; margin-bottom: -4px; border-radius: 8px; }
+    QSlider::handle:horizontal:hover { background: #007BFF; border-color: #0056b3;}
+    QFrame#ButtonFrame { background-color: transparent; margin-top: 15px; border: none; }
+    QPushButton { font-family: "Segoe UI Semibold", "Microsoft YaHei UI Semibold", sans-serif; font-size: 10.5pt; color: #FFFFFF; padding: 9px 18px; border-radius: 6px; border: none; min-height: 30px; text-align: center; }
+    QPushButton#SimulateButtonPrimary { background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #007BFF, stop:1 #0056b3); }
+    QPushButton#SimulateButtonPrimary:hover { background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #0069D9, stop:1 #004085); }
+    QPushButton#SimulateButtonPrimary:pressed { background-color: #004085; }
+    QPushButton#ResetButton { background-color: #6C757D; color: #FFFFFF; }
+    QPushButton#ResetButton:hover { background-color: #5A6268; }
+    QPushButton#ResetButton:pressed { background-color: #495057; }
+    QPushButton /* Export Button style */ { padding: 6px 12px; font-size: 9.5pt; min-height: 28px; background-color: #E9ECEF; color: #212529; border: 1px solid #CED4DA; }
+    QPushButton:hover { background-color: #DEE2E6; border-color: #B9BEC3; }
+    QPushButton:pressed { background-color: #D3D9DF; border-color: #AEB5BC; }
+    QTextBrowser#ParamInfoDisplayCard, QTextBrowser#AnalysisDisplayCard { background-color: #FFFFFF; border: 1px solid #E0E5EA; border-radius: 8px; padding: 0px; }
+    QWidget#RightPanel { background-color: #F4F6F8; } 
+    QFrame#PlotCard { background-color: #FFFFFF; border-radius: 8px; border: 1px solid #E0E5EA; }
+    QFrame#AnalysisSuperCard { border: none; background-color: transparent; }
+    #MatplotlibToolbarModern { background-color: #FDFEFE; border-bottom: 1px solid #E0E5EA; padding: 2px; border-top-left-radius: 7px; border-top-right-radius: 7px; }
+    #MatplotlibToolbarModern QToolButton { background-color: transparent; border: 1px solid transparent; padding: 3px; margin: 1px; border-radius: 4px; }
+    #MatplotlibToolbarModern QToolButton:hover { background-color: #E0E5EA; border: 1px solid #CCD1D9; }
+    #MatplotlibToolbarModern QToolButton:pressed, #MatplotlibToolbarModern QToolButton:checked { background-color: #CCD1D9; border: 1px solid #A5B1C2; }
+    QStatusBar#AppStatusBar { font-family: "Segoe UI", Arial, sans-serif; font-size: 9.5pt; color: #495057; background-color: #E9ECEF; border-top: 1px solid #D1D8E0; padding-left: 10px; }
+"""
+
+
 class ProfessionalSignalApp(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -193,8 +453,23 @@ class ProfessionalSignalApp(QMainWindow):
         self._create_status_bar()
         self.apply_modern_stylesheet()
         self.current_simulation_results = None
+        self._analysis_generation = 0 # 每次仿真或重置递增，用于丢弃过期的后台分析结果
+        self._analysis_signals = AnalysisSignals(); self._analysis_signals.finished.connect(self._on_analysis_ready)
+        self._strength_buf = None # 网格形状不变时复用的 RSRP 输出缓冲区
+        self._cmap_cache = {} # 颜色映射名称 -> Colormap；colormaps[...] 每次查找都会返回新的副本
+        self._reset_coverage_artists(); self._reset_cdf_artists()
         self.update_param_info_display("welcome")
         self.update_colormap_info_display(0) # Show info for default colormap
+        QTimer.singleShot(0, self._warmup_numba) # 窗口显示后预编译 Numba 内核，避免首次仿真卡顿
+
+    @Slot()
+    def _warmup_numba(self):
+        # 在主线程的事件循环空闲时执行：首次编译会导入大量模块，放到工作线程与 PySide6 的导入钩子并发会导致解释器崩溃
+        if not HAS_NUMBA: return
+        ready_message = self.status_bar.currentMessage()
+        self.status_bar.showMessage("正在预编译计算内核..."); QApplication.processEvents()
+        warmup_strength_kernel()
+        self.status_bar.showMessage(ready_message)
 
     def _create_left_panel(self):
         # ... (Code from previous _create_left_panel method, but with cmap_combo connection) ...
@@ -234,6 +509,7 @@ class ProfessionalSignalApp(QMainWindow):
             "step": ("网格步长 (米)", self.default_param_values["step"], 1.0, "step_desc", "📏"),
         }
         self.param_inputs_widgets = {}
+        self.param_settled_notifiers = {} # 滑块参数的同步/防抖对象，连接其 valueSettled 信号以响应参数变化
         groups_order = [
             ("场景与基站核心参数", ["env_type", "bs_x", "bs_y", "tx_power", "antenna_gain", "frequency", "noise_floor"]),
             ("模拟区域与精度", ["x_min", "x_max", "y_min", "y_max", "step"])
@@ -253,11 +529,12 @@ class ProfessionalSignalApp(QMainWindow):
                 if len(param_data) == 5 and isinstance(param_data[-1], list):
                     label_text, default_val, info_key, emoji, slider_params = param_data
                     min_s, max_s, step_s, dec_s = slider_params
-                    combo_widget, slider, spinbox = create_slider_spinbox_combo(
+                    combo_widget, slider, spinbox, sync = create_slider_spinbox_combo(
                         label_text, info_key, emoji, min_s, max_s, default_val, step_s, dec_s, parent_app=self)
                     group_layout.addWidget(combo_widget, row, 0, 1, 2)
                     self.param_inputs_widgets[key] = spinbox
                     self.param_inputs_widgets[key + "_slider"] = slider
+                    self.param_settled_notifiers[key] = sync
                 else:
                     if key == "env_type": label_text, default_idx, options_keys, info_key, emoji_icon = param_data
                     else: label_text, default_val, step_v, info_key, emoji_icon = param_data
@@ -315,6 +592,11 @@ class ProfessionalSignalApp(QMainWindow):
         left_v_layout.addWidget(param_scroll_area, 3)
         self.param_info_display = QTextBrowser(); self.param_info_display.setObjectName("ParamInfoDisplayCard")
         self.param_info_display.setOpenExternalLinks(True)
+        # 每条说明在启动时预先解析为一个 QTextDocument，点击时只切换文档
+        # 文档以主窗口为父对象：setDocument 会删除作为浏览器子对象的旧文档
+        self._param_docs = {key: self._make_info_document(html) for key, html in self.parameter_explanations.items()}
+        self._cmap_docs = {name: self._make_info_document(html) for name, html in self.colormap_explanations.items()}
+        self._fallback_info_doc = self._make_info_document("")
         left_v_layout.addWidget(self.param_info_display, 2)
 
 
@@ -327,7 +609,8 @@ class ProfessionalSignalApp(QMainWindow):
         right_v_layout.setSpacing(15)
         plot_card = QFrame(); plot_card.setObjectName("PlotCard")
         plot_layout = QVBoxLayout(plot_card); plot_layout.setContentsMargins(1,1,1,1)
-        self.figure = plt.figure(facecolor='white')
+        # 直接构造 Figure 嵌入 Qt 画布，不经过 pyplot 的全局图形管理
+        self.figure = Figure(facecolor='white')
         self.canvas = FigureCanvas(self.figure)
         toolbar_layout = QHBoxLayout()
         self.toolbar = NavigationToolbar(self.canvas, self)
@@ -344,14 +627,14 @@ class ProfessionalSignalApp(QMainWindow):
         analysis_v_layout.setContentsMargins(0,0,0,0)
         self.analysis_display = QTextBrowser(); self.analysis_display.setObjectName("AnalysisDisplayCard")
         self.analysis_display.setReadOnly(True); self.analysis_display.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-        self.analysis_display_initial_html = self.html_global_css + \
-                                             "<div class='card-header'><h3>覆盖分析概要</h3></div>" + \
+        self.analysis_display.document().setDefaultStyleSheet(self.html_global_css_body)
+        self.analysis_display_initial_html = "<div class='card-header'><h3>覆盖分析概要</h3></div>" + \
                                              "<div class='card-content'><p>仿真完成后，此处将展示详细的覆盖数据解读与专业分析。</p></div>"
         self.analysis_display.setHtml(self.analysis_display_initial_html)
         analysis_v_layout.addWidget(self.analysis_display, 2)
         cdf_plot_card = QFrame(); cdf_plot_card.setObjectName("PlotCard")
         cdf_plot_layout = QVBoxLayout(cdf_plot_card); cdf_plot_layout.setContentsMargins(5,5,5,5)
-        self.cdf_figure = plt.figure(figsize=(6, 3.5), facecolor='white', dpi=90)
+        self.cdf_figure = Figure(figsize=(6, 3.5), facecolor='white', dpi=90)
         self.cdf_canvas = FigureCanvas(self.cdf_figure)
         cdf_plot_layout.addWidget(self.cdf_canvas)
         analysis_v_layout.addWidget(cdf_plot_card, 3)
@@ -366,8 +649,8 @@ class ProfessionalSignalApp(QMainWindow):
         self.status_bar.showMessage("平台就绪：请在左侧配置参数，点击参数名称查看说明，然后运行仿真。")
 
     def setup_parameter_info_data(self):
-        self.html_global_css = """
-        <style>
+        # 纯 CSS 规则：参数说明与分析报告面板通过 setDefaultStyleSheet 只解析一次，各条目本身只是 HTML 片段
+        self.html_global_css_body = """
             body { font-family: "Segoe UI", "Microsoft YaHei UI", sans-serif; font-size: 10pt; color: #34495E; line-height: 1.6; }
             .card-header { background-color: #F0F3F4; padding: 10px 15px; border-bottom: 1px solid #E0E5EA; border-top-left-radius: 7px; border-top-right-radius: 7px; margin:-1px -1px 0 -1px; }
             .card-header h3 { color: #2C3A47; font-size: 12pt; font-weight: bold; margin:0; padding:0; }
@@ -387,12 +670,11 @@ class ProfessionalSignalApp(QMainWindow):
             .rsrp-marginal { font-weight:bold; color:#FD7E14; }
             .rsrp-poor { font-weight:bold; color:#DC3545; }
             .cmap-example-img { max-width: 250px; height: auto; display: block; margin-top: 10px; border: 1px solid #ddd; border-radius: 4px;}
-        </style>
         """ # Added .cmap-example-img style
 
         self.parameter_explanations = {
-            "welcome": self.html_global_css + "<div class='card-header'><h3>参数说明</h3></div><div class='card-content'><p>欢迎使用5G覆盖仿真平台！请点击左侧面板中的<span class='param-highlight'>参数名称</span> (例如“发射功率”)，此处将显示该参数的详细定义、在5G网络中的作用，以及调整它对网络覆盖的典型影响。</p><p><b>新增功能:</b><ul><li>主要参数（功率、增益、频率）增加了滑块调节。</li><li>可以选择热力图的颜色映射方案 (点击下拉框查看说明)。</li><li>分析报告下方增加了RSRP累积分布函数(CDF)图。</li><li>增加了背景噪声参数输入。</li><li>可导出覆盖图。</li></ul></p></div>",
-            "env_type_desc": self.html_global_css + """<div class='card-header'><h3>🏞️ 环境场景类型</h3></div>
+            "welcome": "<div class='card-header'><h3>参数说明</h3></div><div class='card-content'><p>欢迎使用5G覆盖仿真平台！请点击左侧面板中的<span class='param-highlight'>参数名称</span> (例如“发射功率”)，此处将显示该参数的详细定义、在5G网络中的作用，以及调整它对网络覆盖的典型影响。</p><p><b>新增功能:</b><ul><li>主要参数（功率、增益、频率）增加了滑块调节。</li><li>可以选择热力图的颜色映射方案 (点击下拉框查看说明)。</li><li>分析报告下方增加了RSRP累积分布函数(CDF)图。</li><li>增加了背景噪声参数输入。</li><li>可导出覆盖图。</li></ul></p></div>",
+            "env_type_desc": """<div class='card-header'><h3>🏞️ 环境场景类型</h3></div>
                                <div class='card-content'>
                                <p><b>定义：</b>选择基站所处的典型无线传播环境。不同的环境（如密集城区、一般城区、郊区、农村）对无线信号的传播和衰减有显著不同的影响。</p>
                                <p><b>作用与影响：</b>
@@ -405,18 +687,18 @@ class ProfessionalSignalApp(QMainWindow):
                                </p>
                                <p class='pro-tip'><b>专业提示：</b>本仿真器使用简化的模型调整来示意不同环境的影响。实际网络规划会采用更精确的传播模型（如Okumura-Hata, COST231-Hata, 3GPP TR 38.901等），这些模型会考虑基站和终端天线高度、建筑物平均高度、街道宽度等更多细节参数。</p>
                                </div>""",
-            "bs_x_desc": self.html_global_css + """<div class='card-header'><h3>📍 基站 X/Y 坐标 (米)</h3></div>
+            "bs_x_desc": """<div class='card-header'><h3>📍 基站 X/Y 坐标 (米)</h3></div>
                            <div class='card-content'>
                            <p><b>定义：</b>基站在模拟地图上的水平 (X) 和垂直 (Y) 位置。这是所有距离和信号强度计算的<b>几何中心</b>。</p>
                            <p><b>作用与影响：</b>此参数直接决定了信号覆盖区域的<b>地理中心位置</b>。改变基站坐标会整体平移信号覆盖图。在实际网络规划中，基站选址是首要考虑因素，需结合目标覆盖区域的地形地貌、建筑物分布、用户密度以及与周边基站的协同关系等。</p>
                            <p class='pro-tip'><b>专业提示：</b>不合理的基站选址可能导致覆盖空洞、越区覆盖（干扰邻小区）或资源浪费。</p>
                            </div>""",
-            "bs_y_desc": self.html_global_css + """<div class='card-header'><h3>📍 基站 X/Y 坐标 (米)</h3></div>
+            "bs_y_desc": """<div class='card-header'><h3>📍 基站 X/Y 坐标 (米)</h3></div>
                            <div class='card-content'>
                            <p>（同基站X坐标）</p>
                            <p><b>定义：</b>基站在模拟地图上的垂直 (Y) 位置。</p>
                            </div>""",
-            "tx_power_desc": self.html_global_css + """<div class='card-header'><h3>🔋 发射功率 (dBm)</h3></div>
+            "tx_power_desc": """<div class='card-header'><h3>🔋 发射功率 (dBm)</h3></div>
                                 <div class='card-content'>
                                 <p><b>定义：</b>基站发射天线端口输出的无线电信号能量强度，通常指单个载波或一个小区总的<b>传导功率</b>。单位 dBm (分贝毫瓦) 是一个对数单位，0 dBm = 1 mW。</p>
                                 <p><b>作用与影响：</b>
@@ -427,7 +709,7 @@ class ProfessionalSignalApp(QMainWindow):
                                 </p>
                                 <p class='pro-tip'><b>专业提示：</b>发射功率并非越大越好。虽然提高功率能扩大覆盖，但过高的功率会增加对邻近小区的干扰，可能导致整个网络性能下降（“呼吸效应”的体现之一）。5G宏基站典型单通道传导功率范围约 <b>20W (43dBm) 至 80W (49dBm)</b>。总功率会根据配置的通道数和带宽而变化。功率控制是网络优化的重要手段。</p>
                                 </div>""",
-            "antenna_gain_desc": self.html_global_css + """<div class='card-header'><h3>📡 天线增益 (dBi)</h3></div>
+            "antenna_gain_desc": """<div class='card-header'><h3>📡 天线增益 (dBi)</h3></div>
                                    <div class='card-content'>
                                    <p><b>定义：</b>衡量天线将输入功率有效地<b>汇聚并辐射到特定方向</b>的能力，相对于一个理想的、无损耗的全向点源天线 (Isotropic Antenna) 的增益。单位 dBi。</p>
                                    <p><b>作用与影响：</b>天线通过其方向性图样将能量集中在主辐射瓣内。
@@ -436,7 +718,7 @@ class ProfessionalSignalApp(QMainWindow):
                                    </p>
                                    <p class='pro-tip'><b>专业提示：</b>EIRP (dBm) = 发射功率(dBm) + 天线增益(dBi) – 线缆损耗(dB)。EIRP是链路预算中真正决定远端信号强度的关键。5G Massive MIMO天线系统具有非常高的等效增益和灵活的波束赋形能力，是实现精准覆盖和容量提升的核心技术之一。典型5G宏站天线增益在 <b>15 dBi 到 25 dBi</b> 之间。</p>
                                    </div>""",
-            "frequency_desc": self.html_global_css + """<div class='card-header'><h3>📶 工作频率 (MHz)</h3></div>
+            "frequency_desc": """<div class='card-header'><h3>📶 工作频率 (MHz)</h3></div>
                                <div class='card-content'>
                                <p><b>定义：</b>基站发射无线电波所使用的中心频率。5G网络在全球范围内分配了多个频段，通常分为FR1 (Sub-6GHz，如700MHz, 2.1GHz, 2.6GHz, 3.5GHz, 4.9GHz) 和FR2 (毫米波，如26GHz, 28GHz, 39GHz)。</p>
                                <p><b>作用与影响：</b>频率是影响无线电波<b>传播特性</b>的核心物理因素。
@@ -447,7 +729,7 @@ class ProfessionalSignalApp(QMainWindow):
                                </p>
                                <p class='pro-tip'><b>专业提示：</b>自由空间路径损耗 (FSPL) 与频率的平方成正比 (FSPL ∝ f²)。这意味着，在相同距离下，频率越高，信号衰减越严重。因此，不同频段的组网策略和站址密度会有显著差异。</p>
                                </div>""",
-            "noise_floor_desc": self.html_global_css + """<div class='card-header'><h3>🤫 背景噪声 (dBm)</h3></div>
+            "noise_floor_desc": """<div class='card-header'><h3>🤫 背景噪声 (dBm)</h3></div>
                                    <div class='card-content'>
                                    <p><b>定义：</b>接收机在没有期望信号存在时，自身产生的内部噪声以及从外部环境接收到的所有不需要的射频能量的总和，通常表示为一个等效的噪声功率电平。</p>
                                    <p><b>作用与影响：</b>背景噪声是限制通信系统性能的关键因素。它直接影响信噪比 (SNR) 和信干噪比 (SINR)。
@@ -456,12 +738,12 @@ class ProfessionalSignalApp(QMainWindow):
                                    </p>
                                    <p class='pro-tip'><b>专业提示：</b>典型的5G NR接收机在室温下的热噪声基底约为 -174 dBm/Hz。对于一个20MHz带宽的信道，总的热噪声约为 -174 dBm/Hz + 10*log10(20*10^6 Hz) ≈ -101 dBm。再加上接收机自身的噪声系数 (Noise Figure, NF)，例如5-7 dB，则实际的噪声基底可能在 <b>-96 dBm 至 -94 dBm</b> 左右。此参数对于后续计算SINR至关重要。</p>
                                    </div>""",
-            "area_desc": self.html_global_css + """<div class='card-header'><h3>↔️↕️ 模拟区域范围 (米)</h3></div>
+            "area_desc": """<div class='card-header'><h3>↔️↕️ 模拟区域范围 (米)</h3></div>
                             <div class='card-content'>
                             <p><b>定义：</b>设定进行信号覆盖仿真的二维地理区域的边界 (X轴和Y轴的最小、最大坐标)。</p>
                             <p><b>作用与影响：</b>此参数本身不直接影响无线电波的物理传播特性，但它决定了仿真程序<b>计算和显示信号强度分布图的可视范围</b>。合理的范围设置有助于聚焦于目标分析区域。</p>
                             </div>""",
-            "step_desc": self.html_global_css + """<div class='card-header'><h3>📏 网格步长 (米)</h3></div>
+            "step_desc": """<div class='card-header'><h3>📏 网格步长 (米)</h3></div>
                            <div class='card-content'>
                            <p><b>定义：</b>在选定的模拟区域内，进行信号强度计算的<b>空间采样点间距</b>。步长越小，计算点越密集，形成的网格越精细。</p>
                            <p><b>作用与影响：</b>
@@ -474,37 +756,37 @@ class ProfessionalSignalApp(QMainWindow):
                            </div>""",
         }
         self.colormap_explanations = {
-            'Viridis (默认)': self.html_global_css + """<div class='card-header'><h3>Viridis 颜色映射</h3></div>
+            'Viridis (默认)': """<div class='card-header'><h3>Viridis 颜色映射</h3></div>
                                  <div class='card-content'>
                                  <p><b>特点：</b>感知统一、色盲友好、亮度单调。从深紫色/蓝色 (低RSRP值) 过渡到绿色，再到亮黄色 (高RSRP值)。</p>
                                  <p><b>适用场景：</b>科学数据可视化，能准确反映数据变化，避免视觉偏差。是Matplotlib的默认颜色图之一。</p>
                                  <!-- <img class='cmap-example-img' src='path/to/viridis_example.png' alt='Viridis示例'></img> -->
                                  </div>""",
-            'Plasma': self.html_global_css + """<div class='card-header'><h3>Plasma 颜色映射</h3></div>
+            'Plasma': """<div class='card-header'><h3>Plasma 颜色映射</h3></div>
                          <div class='card-content'>
                          <p><b>特点：</b>感知统一、色盲友好。从深蓝色 (低值) 过渡到洋红色，再到亮黄色 (高值)。</p>
                          <p><b>适用场景：</b>与Viridis类似，提供了另一种鲜明的色觉体验。</p>
                          <!-- <img class='cmap-example-img' src='path/to/plasma_example.png' alt='Plasma示例'></img> -->
                          </div>""",
-            'Inferno': self.html_global_css + """<div class='card-header'><h3>Inferno 颜色映射</h3></div>
+            'Inferno': """<div class='card-header'><h3>Inferno 颜色映射</h3></div>
                           <div class='card-content'>
                           <p><b>特点：</b>感知统一。从黑色 (低值) 过渡到红色、橙色，再到亮黄色 (高值)。</p>
                           <p><b>适用场景：</b>常用于表示强度或温度等物理量，颜色过渡较为激烈。</p>
                           <!-- <img class='cmap-example-img' src='path/to/inferno_example.png' alt='Inferno示例'></img> -->
                           </div>""",
-            'Magma': self.html_global_css + """<div class='card-header'><h3>Magma 颜色映射</h3></div>
+            'Magma': """<div class='card-header'><h3>Magma 颜色映射</h3></div>
                          <div class='card-content'>
                          <p><b>特点：</b>感知统一。从黑色 (低值) 过渡到洋红色、橙色，再到近白色 (高值)。</p>
                          <p><b>适用场景：</b>与Inferno类似，但高值端更亮，对比度更强。</p>
                          <!-- <img class='cmap-example-img' src='path/to/magma_example.png' alt='Magma示例'></img> -->
                          </div>""",
-            'RdYlBu (蓝黄红)': self.html_global_css + """<div class='card-header'><h3>RdYlBu (蓝-黄-红) 颜色映射</h3></div>
+            'RdYlBu (蓝黄红)': """<div class='card-header'><h3>RdYlBu (蓝-黄-红) 颜色映射</h3></div>
                          <div class='card-content'>
                          <p><b>特点：</b>发散型颜色映射。这里使用反向 (`_r`)，即蓝色(低RSRP值)-黄色(中RSRP值)-红色(高RSRP值)。</p>
                          <p><b>适用场景：</b>通常用于数据有自然中心点或需要突出两端极值的情况。对于RSRP这种单调变化的信号强度，如果希望红色代表强信号，蓝色代表弱信号，此映射适用。</p>
                          <!-- <img class='cmap-example-img' src='path/to/rdylbu_example.png' alt='RdYlBu示例'></img> -->
                          </div>""",
-            'RdYlGn (绿黄红)': self.html_global_css + """<div class='card-header'><h3>RdYlGn (绿-黄-红) 颜色映射</h3></div>
+            'RdYlGn (绿黄红)': """<div class='card-header'><h3>RdYlGn (绿-黄-红) 颜色映射</h3></div>
                          <div class='card-content'>
                          <p><b>特点：</b>发散型颜色映射，常用于表示好坏。这里使用反向 (`_r`)，即绿色(低RSRP值)-黄色(中RSRP值)-红色(高RSRP值)。</p>
                          <p><b>适用场景：</b>如果希望红色代表强信号，绿色代表弱信号，此映射适用。若希望绿色代表好信号（高RSRP），则需要调整颜色条的映射或使用非反向版本并注意颜色条方向。</p>
@@ -513,21 +795,26 @@ class ProfessionalSignalApp(QMainWindow):
         }
 
 
+    def _make_info_document(self, html):
+        doc = QTextDocument(self)
+        doc.setDefaultFont(self.param_info_display.font()); doc.setDefaultStyleSheet(self.html_global_css_body); doc.setHtml(html)
+        return doc
+
     @Slot(str)
     def update_param_info_display(self, key):
         # ... (Same as before) ...
-        if key in self.parameter_explanations:
-            self.param_info_display.setHtml(self.parameter_explanations[key])
+        if key in self._param_docs:
+            self.param_info_display.setDocument(self._param_docs[key])
             self.param_info_display.moveCursor(QTextCursor.MoveOperation.Start)
         else:
-            self.param_info_display.setHtml(
-                self.html_global_css + f"<div class='card-content'><p>没有关于键 {key} 的信息。</p></div>")
+            self._fallback_info_doc.setHtml(f"<div class='card-content'><p>没有关于键 {key} 的信息。</p></div>")
+            self.param_info_display.setDocument(self._fallback_info_doc)
 
     @Slot(int)
     def update_colormap_info_display(self, index):
         selected_cmap_name = self.cmap_combo.currentText()
-        if selected_cmap_name in self.colormap_explanations:
-            self.param_info_display.setHtml(self.colormap_explanations[selected_cmap_name])
+        if selected_cmap_name in self._cmap_docs:
+            self.param_info_display.setDocument(self._cmap_docs[selected_cmap_name])
             self.param_info_display.moveCursor(QTextCursor.MoveOperation.Start)
         else:
             # Fallback or do nothing
@@ -536,68 +823,7 @@ class ProfessionalSignalApp(QMainWindow):
 
     def apply_modern_stylesheet(self):
         # ... (Same as your last provided version) ...
-        qss = """
-            QMainWindow { background-color: #F4F6F8; }
-            QSplitter#MainSplitter::handle { background-color: #D1D8E0; width: 1px; }
-            QWidget#LeftPanel { background-color: #FFFFFF; border-right: 1px solid #E0E5EA; }
-            QScrollArea#ParameterScrollArea { border: none; background-color: transparent; }
-            QWidget#ParamInputCardWidget { background-color: #FFFFFF; }
-            QGroupBox#ParameterGroup {
-                font-family: "Segoe UI Semibold", "Microsoft YaHei UI Semibold", sans-serif;
-                font-size: 12pt; color: #2C3A47; border: 1px solid #E7E9EC;
-                border-radius: 8px; margin-top: 12px; padding: 10px 15px 15px 15px;
-                background-color: #FCFDFE;
-            }
-            QGroupBox#ParameterGroup::title {
-                subcontrol-origin: margin; subcontrol-position: top left; padding: 5px 12px;
-                margin-left: 10px; background-color: #5D6D7E; color: #FFFFFF;
-                border-radius: 6px; font-size: 10pt; font-weight: bold;
-            }
-            QLabel#EmojiIconLabel { font-size: 12pt; padding-right: 4px; }
-            QLabel#ClickableParamLabel {
-                font-family: "Segoe UI", "Microsoft YaHei UI", sans-serif;
-                font-size: 10pt; color: #34495E; padding: 4px 0px; text-decoration: none;
-            }
-            QLabel#ClickableParamLabel:hover { color: #007BFF; text-decoration: underline; }
-            QSpinBox#InputField, QDoubleSpinBox#InputField, QComboBox#ComboBoxField {
-                font-family: "Segoe UI", "Consolas", monospace;
-                font-size: 10pt; padding: 7px 9px; border: 1px solid #CCD1D9;
-                border-radius: 5px; background-color: #FDFEFE; color: #1F2933; min-height: 24px;
-            }
-            QComboBox#ComboBoxField QAbstractItemView { 
-                border: 1px solid #CCD1D9; background-color: white;
-                selection-background-color: #007BFF; font-size: 10pt;
-            }
-            QSpinBox#InputField:focus, QDoubleSpinBox#InputField:focus, QComboBox#ComboBoxField:focus {
-                border-color: #007BFF; background-color: #FFFFFF; 
-            }
-            QSlider::groove:horizontal { border: 1px solid #bbb; background: white; height: 8px; border-radius: 4px; }
-            QSlider::sub-page:horizontal { background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #007BFF, stop:1 #56CCF2); border: 1px solid #777; height: 8px; border-radius: 4px; }
-            QSlider::add-page:horizontal { background: #fff; border: 1px solid #777; height: 8px; border-radius: 4px; }
-            QSlider::handle:horizontal { background: qradialgradient(cx:0.5, cy:0.5, radius:0.5, fx:0.5, fy:0.5, stop:0.6 #e1e1e1, stop:0.776 #3D72A4); border: 1px solid #777; width: 16px; margin-top: -4px; margin-bottom: -4px; border-radius: 8px; }
-            QSlider::handle:horizontal:hover { background: #007BFF; border-color: #0056b3;}
-            QFrame#ButtonFrame { background-color: transparent; margin-top: 15px; border: none; }
-            QPushButton { font-family: "Segoe UI Semibold", "Microsoft YaHei UI Semibold", sans-serif; font-size: 10.5pt; color: #FFFFFF; padding: 9px 18px; border-radius: 6px; border: none; min-height: 30px; text-align: center; }
-            QPushButton#SimulateButtonPrimary { background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #007BFF, stop:1 #0056b3); }
-            QPushButton#SimulateButtonPrimary:hover { background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #0069D9, stop:1 #004085); }
-            QPushButton#SimulateButtonPrimary:pressed { background-color: #004085; }
-            QPushButton#ResetButton { background-color: #6C757D; color: #FFFFFF; }
-            QPushButton#ResetButton:hover { background-color: #5A6268; }
-            QPushButton#ResetButton:pressed { background-color: #495057; }
-            QPushButton /* Export Button style */ { padding: 6px 12px; font-size: 9.5pt; min-height: 28px; background-color: #E9ECEF; color: #212529; border: 1px solid #CED4DA; }
-            QPushButton:hover { background-color: #DEE2E6; border-color: #B9BEC3; }
-            QPushButton:pressed { background-color: #D3D9DF; border-color: #AEB5BC; }
-            QTextBrowser#ParamInfoDisplayCard, QTextBrowser#AnalysisDisplayCard { background-color: #FFFFFF; border: 1px solid #E0E5EA; border-radius: 8px; padding: 0px; }
-            QWidget#RightPanel { background-color: #F4F6F8; } 
-            QFrame#PlotCard { background-color: #FFFFFF; border-radius: 8px; border: 1px solid #E0E5EA; }
-            QFrame#AnalysisSuperCard { border: none; background-color: transparent; }
-            #MatplotlibToolbarModern { background-color: #FDFEFE; border-bottom: 1px solid #E0E5EA; padding: 2px; border-top-left-radius: 7px; border-top-right-radius: 7px; }
-            #MatplotlibToolbarModern QToolButton { background-color: transparent; border: 1px solid transparent; padding: 3px; margin: 1px; border-radius: 4px; }
-            #MatplotlibToolbarModern QToolButton:hover { background-color: #E0E5EA; border: 1px solid #CCD1D9; }
-            #MatplotlibToolbarModern QToolButton:pressed, #MatplotlibToolbarModern QToolButton:checked { background-color: #CCD1D9; border: 1px solid #A5B1C2; }
-            QStatusBar#AppStatusBar { font-family: "Segoe UI", Arial, sans-serif; font-size: 9.5pt; color: #495057; background-color: #E9ECEF; border-top: 1px solid #D1D8E0; padding-left: 10px; }
-        """
-        self.setStyleSheet(qss)
+        self.setStyleSheet(_QSS)
 
     @Slot()
     def reset_parameters(self):
@@ -614,11 +840,12 @@ class ProfessionalSignalApp(QMainWindow):
                 if param_data and len(param_data) == 5 and isinstance(param_data[-1], list):
                     slider_params = param_data[-1]; decimals = slider_params[3]; slider_multiplier = 10**decimals
                     slider_widget.setValue(int(default_value * slider_multiplier))
+        self._analysis_generation += 1 # 丢弃尚未返回的后台分析结果
         self.status_bar.showMessage("参数已重置为默认值。", 4000)
         self.update_param_info_display("welcome")
         self.update_colormap_info_display(self.default_param_values["colormap"]) # Reset colormap info
         self.analysis_display.setHtml(self.analysis_display_initial_html)
-        self.cdf_figure.clear(); self.cdf_canvas.draw()
+        self.cdf_figure.clear(); self._reset_cdf_artists(); self.cdf_canvas.draw()
 
 
     @Slot()
@@ -627,99 +854,141 @@ class ProfessionalSignalApp(QMainWindow):
         self.status_bar.showMessage("正在初始化仿真..."); QApplication.processEvents()
         try:
             self.status_bar.showMessage("正在读取参数..."); QApplication.processEvents()
-            bs_params = {'x': self.param_inputs_widgets["bs_x"].value(), 'y': self.param_inputs_widgets["bs_y"].value()}
-            tx_power, antenna_gain, frequency = self.param_inputs_widgets["tx_power"].value(), self.param_inputs_widgets["antenna_gain"].value(), self.param_inputs_widgets["frequency"].value()
-            env_type_key = self.param_inputs_widgets["env_type"].currentData()
-            x_min, x_max, y_min, y_max, step = self.param_inputs_widgets["x_min"].value(), self.param_inputs_widgets["x_max"].value(), self.param_inputs_widgets["y_min"].value(), self.param_inputs_widgets["y_max"].value(), self.param_inputs_widgets["step"].value()
+            w = self.param_inputs_widgets # 所有控件值只读取一次，后续绘图直接使用这些局部变量
+            bs_params = {'x': w["bs_x"].value(), 'y': w["bs_y"].value()}
+            tx_power, antenna_gain, frequency = w["tx_power"].value(), w["antenna_gain"].value(), w["frequency"].value()
+            env_type_key, cmap_name = w["env_type"].currentData(), w["colormap"].currentText()
+            x_min, x_max, y_min, y_max, step = w["x_min"].value(), w["x_max"].value(), w["y_min"].value(), w["y_max"].value(), w["step"].value()
             if step <= 0: QMessageBox.warning(self, "参数错误", "网格步长必须为正数。"); self.status_bar.showMessage("仿真中止：步长错误。", 5000); return
             if frequency <= 0: QMessageBox.warning(self, "参数错误", "工作频率必须为正数。"); self.status_bar.showMessage("仿真中止：频率错误。", 5000); return
             if x_min > x_max or y_min > y_max: QMessageBox.warning(self, "范围错误", "模拟区域的最小范围不能大于最大范围。"); self.status_bar.showMessage("仿真中止：范围参数错误。", 5000); return
             elif x_min == x_max or y_min == y_max: QMessageBox.information(self, "范围提示", "模拟区域最小范围等于最大范围，将按点/线模拟。")
             self.status_bar.showMessage("正在创建网格..."); QApplication.processEvents()
-            grid_xx, grid_yy = create_grid(x_min, x_max, y_min, y_max, step)
-            if grid_xx.size == 0: QMessageBox.warning(self, "网格错误", "无法创建模拟网格。"); self.status_bar.showMessage("仿真中止：网格创建失败。", 5000); return
+            grid_x, grid_y = create_grid(x_min, x_max, y_min, y_max, step)
+            if grid_x.size == 0 or grid_y.size == 0: QMessageBox.warning(self, "网格错误", "无法创建模拟网格。"); self.status_bar.showMessage("仿真中止：网格创建失败。", 5000); return
             self.status_bar.showMessage("正在计算信号强度..."); QApplication.processEvents()
-            signal_strengths = simulate_signal_strength((grid_xx, grid_yy), bs_params, tx_power, frequency, antenna_gain, env_type_key)
+            grid_shape = (grid_y.size, grid_x.size)
+            if self._strength_buf is None or self._strength_buf.shape != grid_shape: self._strength_buf = np.empty(grid_shape, dtype=np.float32)
+            signal_strengths = simulate_signal_strength((grid_x, grid_y), bs_params, tx_power, frequency, antenna_gain, env_type_key, out=self._strength_buf)
             self.current_simulation_results = signal_strengths
+            # 只做一次 NaN 掩码：绘图统计与后台分析（排序、分档计数、CDF）共用这份一维有效数据
+            valid_strengths = signal_strengths[~np.isnan(signal_strengths)]
             self.status_bar.showMessage("正在绘制覆盖图..."); QApplication.processEvents()
-            self._plot_simulation_results(grid_xx, grid_yy, signal_strengths, bs_params, x_min, x_max, y_min, y_max)
+            self._plot_simulation_results(grid_x, grid_y, signal_strengths, valid_strengths, bs_params, x_min, x_max, y_min, y_max, step, cmap_name)
             total_area_sqm = 0
-            if grid_xx.ndim == 2 and grid_xx.shape[0] > 0 and grid_xx.shape[1] > 0:
-                num_x_points, num_y_points = grid_xx.shape[1], grid_xx.shape[0]
-                if num_x_points > 1 and num_y_points > 1: total_width = (num_x_points - 1) * (grid_xx[0,1] - grid_xx[0,0]); total_height = (num_y_points - 1) * (grid_yy[1,0] - grid_yy[0,0]); total_area_sqm = total_width * total_height
+            if grid_x.size > 0 and grid_y.size > 0:
+                num_x_points, num_y_points = grid_x.size, grid_y.size
+                if num_x_points > 1 and num_y_points > 1: total_width = (num_x_points - 1) * (grid_x[1] - grid_x[0]); total_height = (num_y_points - 1) * (grid_y[1] - grid_y[0]); total_area_sqm = total_width * total_height
                 else: total_area_sqm = step*step
-            self.status_bar.showMessage("正在生成分析报告..."); QApplication.processEvents()
-            self._generate_analysis_report(signal_strengths, total_area_sqm)
-            self._plot_cdf_results(signal_strengths)
-            self.status_bar.showMessage("仿真分析完成！结果已在右侧更新。", 5000)
+            # 报告与 CDF 所需的排序放到线程池中，覆盖图先行显示；结果由 _on_analysis_ready 在 GUI 线程接收
+            self.status_bar.showMessage("正在生成分析报告...")
+            self._analysis_generation += 1
+            QThreadPool.globalInstance().start(AnalysisWorker(self._analysis_generation, valid_strengths, signal_strengths.size, total_area_sqm, self._analysis_signals))
         except ValueError as ve: QMessageBox.warning(self, "参数或计算错误", str(ve)); self.status_bar.showMessage(f"仿真失败：{ve}", 5000)
         except Exception as e: QMessageBox.critical(self, "执行错误", f"发生了一个意外错误: {e}"); self.status_bar.showMessage(f"仿真失败: {e}", 5000); import traceback; traceback.print_exc()
 
 
-    def _plot_simulation_results(self, grid_xx, grid_yy, strengths, bs_params, x_min, x_max, y_min, y_max):
-        # ... (Same as your last provided version) ...
-        self.figure.clear(); ax = self.figure.add_subplot(111, facecolor='#FCFDFE')
-        if strengths is None or strengths.size == 0: ax.text(0.5,0.5,"无有效数据显示", ha='center',va='center',transform=ax.transAxes,fontsize=14,color='gray'); self.canvas.draw(); return
-        s_min_val, s_max_val = np.nanmin(strengths), np.nanmax(strengths)
-        print(f"原始信号强度统计: Min={s_min_val:.2f}, Max={s_max_val:.2f}, Mean={np.nanmean(strengths):.2f}, Median={np.nanmedian(strengths):.2f}")
-        selected_cmap_name = self.param_inputs_widgets["colormap"].currentText(); cmap = plt.get_cmap(self.cmaps.get(selected_cmap_name, 'viridis'))
+    def _plot_simulation_results(self, grid_x, grid_y, strengths, valid, bs_params, x_min, x_max, y_min, y_max, step_val, selected_cmap_name):
+        # 坐标轴、图像、基站标记与颜色条只在首次绘制时创建，之后的仿真仅更新数据
+        if strengths is None or strengths.size == 0: self._show_coverage_message("无有效数据显示"); return
+        if valid.size == 0: self._show_coverage_message("计算结果全部无效 (NaN)"); return
+        s_min_val, s_max_val = valid.min(), valid.max()
+        print(f"原始信号强度统计: Min={s_min_val:.2f}, Max={s_max_val:.2f}, Mean={valid.mean():.2f}")
+        cmap = self._get_cmap(selected_cmap_name)
         fixed_vmin, fixed_vmax = -125, -65; norm_vmin_actual, norm_vmax_actual = fixed_vmin, fixed_vmax
-        if not (np.isnan(s_min_val) or np.isnan(s_max_val)):
-            if s_min_val == s_max_val: norm_vmin_actual, norm_vmax_actual = s_min_val - 1, s_max_val + 1
-        print(f"绘图使用的归一化范围: vmin={norm_vmin_actual:.2f}, vmax={norm_vmax_actual:.2f}"); norm = plt.Normalize(vmin=norm_vmin_actual, vmax=norm_vmax_actual)
-        if np.all(np.isnan(strengths)): ax.text(0.5,0.5,"计算结果全部无效 (NaN)", ha='center',va='center',transform=ax.transAxes,fontsize=14,color='gray'); self.canvas.draw(); return
-        step_val = self.param_inputs_widgets["step"].value() # Get current step for extent adjustment
+        if s_min_val == s_max_val: norm_vmin_actual, norm_vmax_actual = s_min_val - 1, s_max_val + 1
+        print(f"绘图使用的归一化范围: vmin={norm_vmin_actual:.2f}, vmax={norm_vmax_actual:.2f}")
         plot_extent = [x_min, x_max, y_min, y_max]
         if x_min == x_max: plot_extent[1] = x_max + step_val if step_val > 0 else x_max + 1
         if y_min == y_max: plot_extent[3] = y_max + step_val if step_val > 0 else y_max + 1
         if plot_extent[0] >= plot_extent[1]: plot_extent[1] = plot_extent[0] + 1
         if plot_extent[2] >= plot_extent[3]: plot_extent[3] = plot_extent[2] + 1
-        im = ax.imshow(strengths, extent=plot_extent, origin='lower', cmap=cmap, aspect='auto', norm=norm, interpolation='bicubic')
-        if not (np.isnan(s_min_val) or np.isnan(s_max_val)) and s_min_val != s_max_val and strengths.ndim == 2 and strengths.shape[0] > 1 and strengths.shape[1] > 1:
+        if self._coverage_im is None: self.figure.clear(); ax = self.figure.add_subplot(111, facecolor='#FCFDFE')
+        else: ax = self._coverage_ax
+        # 网格点数不少于坐标轴像素数时双三次插值看不出差别，直接最近邻贴图；粗网格仍用 bicubic 平滑显示
+        ax_bbox = ax.get_window_extent()
+        # 网格点数远超坐标轴像素数时先按步长抽稀再交给 imshow/contour，渲染器本就只能画出这么多像素（范围误差不超过一个像素）
+        stride_y = strengths.shape[0] // max(1, int(ax_bbox.height)) if strengths.shape[0] > 2 * ax_bbox.height else 1
+        stride_x = strengths.shape[1] // max(1, int(ax_bbox.width)) if strengths.shape[1] > 2 * ax_bbox.width else 1
+        if stride_y > 1 or stride_x > 1: strengths, grid_x, grid_y = strengths[::stride_y, ::stride_x], grid_x[::stride_x], grid_y[::stride_y]
+        dense_grid = strengths.shape[1] >= ax_bbox.width and strengths.shape[0] >= ax_bbox.height
+        if self._coverage_im is None:
+            norm = Normalize(vmin=norm_vmin_actual, vmax=norm_vmax_actual)
+            self._coverage_im = ax.imshow(strengths, extent=plot_extent, origin='lower', cmap=cmap, aspect='auto', norm=norm, interpolation='nearest' if dense_grid else 'bicubic')
+            self._bs_scatter = ax.scatter(bs_params['x'], bs_params['y'], color='#E74C3C', marker='h', s=200, edgecolor='black', linewidth=1.2, label='5G基站 (gNB)', zorder=10)
+            ax.legend(fontsize=9.5, loc='upper right', frameon=True, facecolor='white', framealpha=0.85, edgecolor='#B0BEC5')
+            ax.set_title('5G小区RSRP覆盖预测图', fontproperties=ZH_FONT, fontsize=14, weight='bold', color='#34495E'); ax.set_xlabel('X轴距离 (米)', fontproperties=ZH_FONT, fontsize=11, color='#4A5568'); ax.set_ylabel('Y轴距离 (米)', fontproperties=ZH_FONT, fontsize=11, color='#4A5568')
+            ax.grid(True, linestyle=':', alpha=0.6, color='#BCCCDC', linewidth=0.6); ax.tick_params(axis='both', which='major', labelsize=9.5, colors='#5A6268'); ax.set_facecolor('#F8FAFC')
+            try: cbar = self.figure.colorbar(self._coverage_im, ax=ax, shrink=0.9, aspect=25, pad=0.05, extend='both'); cbar.set_label('参考信号接收功率 RSRP (dBm)', fontproperties=ZH_FONT, fontsize=10.5, color='#4A5568'); cbar.ax.tick_params(labelsize=8.5, colors='#5A6268'); cbar.locator = MaxNLocator(nbins=7); cbar.update_ticks(); self._coverage_cbar = cbar
+            except Exception as e_cbar: print(f"绘制颜色条时出错: {e_cbar}")
+            self._coverage_ax = ax
+        else:
+            # set_cmap/set_clim 会通过回调同步颜色条，且保留其刻度定位器
+            self._coverage_im.set_data(strengths); self._coverage_im.set_extent(plot_extent)
+            self._coverage_im.set_cmap(cmap); self._coverage_im.set_clim(norm_vmin_actual, norm_vmax_actual)
+            self._coverage_im.set_interpolation('nearest' if dense_grid else 'bicubic')
+            self._bs_scatter.set_offsets([[bs_params['x'], bs_params['y']]])
+            # 工具栏缩放/平移会关闭自动缩放：重新开启，使视图与新建坐标轴时一样贴合模拟区域与基站位置
+            ax.set_autoscale_on(True); ax.relim(); ax.update_datalim([[bs_params['x'], bs_params['y']]]); ax.autoscale_view()
+        if self._contour_set is not None: self._contour_set.remove(); self._contour_set = None
+        if s_min_val != s_max_val and strengths.ndim == 2 and strengths.shape[0] > 1 and strengths.shape[1] > 1:
             contour_levels = [-115, -105, -95, -85, -75]; valid_contour_levels = [lvl for lvl in contour_levels if norm_vmin_actual < lvl < norm_vmax_actual and s_min_val < lvl < s_max_val]
             if valid_contour_levels:
-                try: cs = ax.contour(grid_xx, grid_yy, strengths, levels=valid_contour_levels, colors='black', linewidths=0.7, alpha=0.8); ax.clabel(cs, inline=True, fontsize=7.5, fmt='%1.0f dBm', colors='black')
+                try: cs = ax.contour(grid_x, grid_y, strengths, levels=valid_contour_levels, colors='black', linewidths=0.7, alpha=0.8); ax.clabel(cs, inline=True, fontsize=7.5, fmt='%1.0f dBm', colors='black'); self._contour_set = cs
                 except Exception as e_contour: print(f"绘制等高线时出错: {e_contour}")
-        ax.scatter(bs_params['x'], bs_params['y'], color='#E74C3C', marker='h', s=200, edgecolor='black', linewidth=1.2, label='5G基站 (gNB)', zorder=10)
-        ax.legend(fontsize=9.5, loc='upper right', frameon=True, facecolor='white', framealpha=0.85, edgecolor='#B0BEC5')
-        ax.set_title('5G小区RSRP覆盖预测图', fontsize=14, weight='bold', color='#34495E'); ax.set_xlabel('X轴距离 (米)', fontsize=11, color='#4A5568'); ax.set_ylabel('Y轴距离 (米)', fontsize=11, color='#4A5568')
-        ax.grid(True, linestyle=':', alpha=0.6, color='#BCCCDC', linewidth=0.6); ax.tick_params(axis='both', which='major', labelsize=9.5, colors='#5A6268'); ax.set_facecolor('#F8FAFC')
-        try: cbar = self.figure.colorbar(im, ax=ax, shrink=0.9, aspect=25, pad=0.05, extend='both'); cbar.set_label('参考信号接收功率 RSRP (dBm)', fontsize=10.5, color='#4A5568'); cbar.ax.tick_params(labelsize=8.5, colors='#5A6268'); cbar.locator = MaxNLocator(nbins=7); cbar.update_ticks()
-        except Exception as e_cbar: print(f"绘制颜色条时出错: {e_cbar}")
-        self.figure.tight_layout(pad=1.8); self.canvas.draw()
-
-
-    def _generate_analysis_report(self, strengths_data, total_area_sqm):
-        # ... (Same as your last provided version, make sure html_global_css is defined or passed if needed) ...
-        if strengths_data is None or strengths_data.size == 0 or np.all(np.isnan(strengths_data)): self.analysis_display.setHtml(self.analysis_display_initial_html); return
-        max_rsrp, min_rsrp, avg_rsrp = np.nanmax(strengths_data), np.nanmin(strengths_data), np.nanmean(strengths_data)
-        excellent_rsrp, good_rsrp, fair_rsrp, poor_rsrp = -80, -95, -105, -115
-        cat_counts = {"excellent": np.sum(strengths_data >= excellent_rsrp), "good": np.sum((strengths_data >= good_rsrp) & (strengths_data < excellent_rsrp)), "fair": np.sum((strengths_data >= fair_rsrp) & (strengths_data < good_rsrp)), "marginal": np.sum((strengths_data >= poor_rsrp) & (strengths_data < fair_rsrp)), "poor": np.sum(strengths_data < poor_rsrp)}
-        total_points = strengths_data.size if strengths_data.size > 0 else 1
-        html_content = f"{self.html_global_css}<div class='card-header'><h3>覆盖分析与专业解读</h3></div><div class='card-content'><p><b>仿真区域概况：</b>...约 <b>{total_area_sqm:.0f} 平方米</b> ...</p><p><b>关键RSRP指标：</b><ul><li>最高RSRP: <span class='rsrp-excellent'>{max_rsrp:.1f} dBm</span></li><li>最低RSRP: <span class='rsrp-poor'>{min_rsrp:.1f} dBm</span></li><li>区域平均RSRP: {avg_rsrp:.1f} dBm</li></ul></p><h4>RSRP电平质量分布...：</h4><p>RSRP ...</p><table><tr><th>质量等级</th><th>RSRP范围 (dBm)</th><th>覆盖点占比</th><th>典型用户体验</th></tr>"
-        levels_info = [("极好", f"≥ {excellent_rsrp}", cat_counts["excellent"], "rsrp-excellent", "高清视频流畅..."), ("良好", f"{good_rsrp} ~ {excellent_rsrp - 0.1:.1f}", cat_counts["good"], "rsrp-good", "网页浏览顺畅..."), ("一般", f"{fair_rsrp} ~ {good_rsrp - 0.1:.1f}", cat_counts["fair"], "rsrp-fair", "基本数据业务..."), ("边缘", f"{poor_rsrp} ~ {fair_rsrp - 0.1:.1f}", cat_counts["marginal"], "rsrp-marginal", "信号弱..."), ("差", f"< {poor_rsrp}", cat_counts["poor"], "rsrp-poor", "可能无法接入...")]
-        for name, rsrp_range, count, style_class, experience in levels_info: percentage = (count / total_points) * 100 if total_points > 0 else 0; html_content += f"""<tr><td><span class='{style_class}'>{name}</span></td><td>{rsrp_range}</td><td>{percentage:.1f}% ({count}点)</td><td>{experience}</td></tr>"""
-        html_content += "</table><div class='pro-tip'><b>专业解读：</b>...</div></div>"
-        self.analysis_display.setHtml(html_content); self.analysis_display.moveCursor(QTextCursor.MoveOperation.Start)
-
-
-    def _plot_cdf_results(self, strengths_data):
-        # ... (Same as your last provided version) ...
-        self.cdf_figure.clear()
-        if strengths_data is None or strengths_data.size == 0 or np.all(np.isnan(strengths_data)): ax_cdf = self.cdf_figure.add_subplot(111); ax_cdf.text(0.5, 0.5, "无有效数据绘制CDF", ha='center', va='center', transform=ax_cdf.transAxes, color='gray'); self.cdf_canvas.draw(); return
-        ax_cdf = self.cdf_figure.add_subplot(111, facecolor='#FCFDFE')
-        data_flat = strengths_data.flatten(); data_flat = data_flat[~np.isnan(data_flat)]
-        if data_flat.size == 0: ax_cdf.text(0.5, 0.5, "无有效数据绘制CDF", ha='center', va='center', transform=ax_cdf.transAxes, color='gray'); self.cdf_canvas.draw(); return
-        sorted_data = np.sort(data_flat); yvals = np.arange(len(sorted_data)) / float(len(sorted_data) -1 if len(sorted_data) > 1 else 1)
-        ax_cdf.plot(sorted_data, yvals, color='#007BFF', linewidth=1.8)
-        ax_cdf.set_title('RSRP 累积分布函数 (CDF)', fontsize=11, weight='bold', color='#34495E'); ax_cdf.set_xlabel('RSRP (dBm)', fontsize=9, color='#4A5568'); ax_cdf.set_ylabel('概率 (P ≤ x)', fontsize=9, color='#4A5568')
-        ax_cdf.grid(True, linestyle=':', alpha=0.7, color='#BCCCDC'); ax_cdf.tick_params(axis='both', which='major', labelsize=8, colors='#5A6268')
+        self.toolbar.update() # 清空导航历史，Home 回到本次仿真的视图而不是首次仿真的范围
+        self.figure.tight_layout(pad=1.8); self.canvas.draw_idle()
+
+    def _get_cmap(self, cmap_display_name):
+        cmap = self._cmap_cache.get(cmap_display_name)
+        if cmap is None: cmap = self._cmap_cache[cmap_display_name] = matplotlib.colormaps[self.cmaps.get(cmap_display_name, 'viridis')]
+        return cmap
+
+    def _show_coverage_message(self, message):
+        self.figure.clear(); self._reset_coverage_artists()
+        ax = self.figure.add_subplot(111, facecolor='#FCFDFE')
+        ax.text(0.5,0.5,message, ha='center',va='center',transform=ax.transAxes,fontproperties=ZH_FONT,fontsize=14,color='gray'); self.canvas.draw_idle()
+
+    def _reset_coverage_artists(self):
+        self._coverage_ax = None; self._coverage_im = None; self._coverage_cbar = None
+        self._bs_scatter = None; self._contour_set = None
+
+    def _reset_cdf_artists(self):
+        self._cdf_ax = None; self._cdf_line = None; self._cdf_threshold_artists = []
+
+
+    @Slot(int, str, object, str)
+    def _on_analysis_ready(self, generation, html, sorted_valid, error):
+        if generation != self._analysis_generation: return # 期间已有新的仿真或重置
+        if error: QMessageBox.critical(self, "执行错误", f"发生了一个意外错误: {error}"); self.status_bar.showMessage(f"仿真失败: {error}", 5000); return
+        try:
+            self.analysis_display.setHtml(html or self.analysis_display_initial_html); self.analysis_display.moveCursor(QTextCursor.MoveOperation.Start)
+            self._plot_cdf_results(sorted_valid)
+            self.status_bar.showMessage("仿真分析完成！结果已在右侧更新。", 5000)
+        except Exception as e: QMessageBox.critical(self, "执行错误", f"发生了一个意外错误: {e}"); self.status_bar.showMessage(f"仿真失败: {e}", 5000); import traceback; traceback.print_exc()
+
+    def _plot_cdf_results(self, sorted_data):
+        # sorted_data: 去除 NaN 并已排序的一维 RSRP 数据；坐标轴与曲线只在首次绘制时创建，之后的仿真仅更新数据
+        if sorted_data is None or sorted_data.size == 0: self.cdf_figure.clear(); self._reset_cdf_artists(); ax_cdf = self.cdf_figure.add_subplot(111); ax_cdf.text(0.5, 0.5, "无有效数据绘制CDF", ha='center', va='center', transform=ax_cdf.transAxes, fontproperties=ZH_FONT, color='gray'); self.cdf_canvas.draw(); return
+        if self._cdf_line is None:
+            self.cdf_figure.clear(); ax_cdf = self.cdf_figure.add_subplot(111, facecolor='#FCFDFE')
+            self._cdf_line, = ax_cdf.plot([], [], color='#007BFF', linewidth=1.8)
+            ax_cdf.set_title('RSRP 累积分布函数 (CDF)', fontproperties=ZH_FONT, fontsize=11, weight='bold', color='#34495E'); ax_cdf.set_xlabel('RSRP (dBm)', fontsize=9, color='#4A5568'); ax_cdf.set_ylabel('概率 (P ≤ x)', fontproperties=ZH_FONT, fontsize=9, color='#4A5568')
+            ax_cdf.grid(True, linestyle=':', alpha=0.7, color='#BCCCDC'); ax_cdf.tick_params(axis='both', which='major', labelsize=8, colors='#5A6268')
+            self._cdf_ax = ax_cdf
+        else: ax_cdf = self._cdf_ax
+        for artist in self._cdf_threshold_artists: artist.remove()
+        self._cdf_threshold_artists = []
+        # 经验CDF直接由排序后的数据得到；大网格按步长抽样绘制，曲线形状不变
+        yvals = np.arange(1, sorted_data.size + 1, dtype=np.float32) / sorted_data.size
+        stride = max(1, sorted_data.size // _CDF_MAX_POINTS)
+        self._cdf_line.set_data(sorted_data[::stride], yvals[::stride])
         rsrp_thresholds = {'差': -115, '边缘': -105, '一般': -95, '良好': -80}; data_min, data_max = sorted_data[0], sorted_data[-1]
-        for label, threshold in rsrp_thresholds.items():
+        threshold_probs = np.searchsorted(sorted_data, list(rsrp_thresholds.values()), side='right') / sorted_data.size # 一次批量二分查找得到各门限的 P(RSRP ≤ x)
+        for threshold, prob in zip(rsrp_thresholds.values(), threshold_probs):
             if data_min < threshold < data_max:
-                prob = np.sum(sorted_data <= threshold) / len(sorted_data)
-                ax_cdf.axhline(y=prob, color='gray', linestyle='--', linewidth=0.6, alpha=0.7); ax_cdf.axvline(x=threshold, color='gray', linestyle='--', linewidth=0.6, alpha=0.7)
-                ax_cdf.text(threshold + 0.5, prob + 0.02, f'{threshold}dBm\n({prob*100:.0f}%)', fontsize=7, color='dimgray', ha='left', va='bottom')
+                self._cdf_threshold_artists += [ax_cdf.axhline(y=prob, color='gray', linestyle='--', linewidth=0.6, alpha=0.7), ax_cdf.axvline(x=threshold, color='gray', linestyle='--', linewidth=0.6, alpha=0.7),
+                                                ax_cdf.text(threshold + 0.5, prob + 0.02, f'{threshold}dBm\n({prob*100:.0f}%)', fontsize=7, color='dimgray', ha='left', va='bottom')]
         ax_cdf.set_ylim(0, 1.05); x_pad = (data_max - data_min) * 0.05 if (data_max - data_min) > 0 else 1; ax_cdf.set_xlim(data_min - x_pad, data_max + x_pad)
         self.cdf_figure.tight_layout(pad=0.8); self.cdf_canvas.draw()
 
@@ -739,4 +1008,6 @@ if __name__ == '__main__':
     app = QApplication(sys.argv)
     window = ProfessionalSignalApp()
     window.show()
-    sys.exit(app.exec())
\ No newline at end of file
+    exit_code = app.exec()
+    QThreadPool.globalInstance().waitForDone() # 等待进行中的后台分析结束，避免退出清理 Qt 对象时任务仍在发射信号
+    sys.exit(exit_code)
\ No newline at end of file